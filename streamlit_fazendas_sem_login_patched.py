@@ -1,19 +1,18 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 from datetime import datetime, date
 import json
+import orjson
 import os
+import threading
 from io import BytesIO
+import pyarrow as pa
+import pyarrow.json as paj
+import pyarrow.parquet as pq
 
-# --- Safe Plotly import for Streamlit Cloud ---
-try:
-    import plotly.express as px
-    import plotly.graph_objects as go
-except ModuleNotFoundError:
-    import sys, subprocess
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "plotly==5.15.0"])
-    import plotly.express as px
-    import plotly.graph_objects as go
+# Plotly é importado dentro das páginas com gráficos, evitando o custo
+# de importação nas páginas de cadastro
 
 
 # ===================================================================
@@ -31,9 +30,19 @@ st.set_page_config(
 # DADOS INICIAIS E CONFIGURAÇÃO
 # ===================================================================
 
-# Arquivo para persistir dados
+# Arquivos para persistir dados
+FAZENDAS_FILE = "fazendas.parquet"
+PRODUCAO_FILE = "producao.parquet"
+
+# Arquivo JSON legado (migrado para Parquet na primeira execução)
 DADOS_FILE = "dados_fazendas_streamlit.json"
 
+# Campos opcionais (lidos com .get): omitidos do registro quando vazios no Parquet
+CAMPOS_OPCIONAIS = {'observacoes', 'telefone', 'email'}
+
+# Colunas lidas na importação de fazendas (sem diferenciar maiúsculas)
+COLUNAS_IMPORTACAO = {'nome', 'fazenda', 'estado', 'cidade', 'hectares', 'ha', 'proprietario', 'telefone', 'email'}
+
 # Dados iniciais das fazendas
 DADOS_INICIAIS = {
     "fazendas": [
@@ -105,55 +114,204 @@ DADOS_INICIAIS = {
 
 @st.cache_data
 def carregar_dados():
-    """Carrega dados do arquivo JSON ou retorna dados iniciais"""
-    if os.path.exists(DADOS_FILE):
+    """Carrega dados dos arquivos Parquet (migrando o JSON legado) ou retorna dados iniciais"""
+    if not os.path.exists(FAZENDAS_FILE) and os.path.exists(DADOS_FILE):
         try:
-            with open(DADOS_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            migrar_json_legado()
+        except:
+            # JSON fora do formato esperado pelo pyarrow: migra via json.load
+            try:
+                with open(DADOS_FILE, 'r', encoding='utf-8') as f:
+                    dados = json.load(f)
+            except:
+                return DADOS_INICIAIS
+            try:
+                gravar_parquet(dados)
+            except:
+                return dados
+    
+    if os.path.exists(FAZENDAS_FILE):
+        try:
+            return {
+                'fazendas': ler_registros(FAZENDAS_FILE),
+                'producao': ler_registros(PRODUCAO_FILE)
+            }
         except:
             return DADOS_INICIAIS
     return DADOS_INICIAIS
 
-def salvar_dados(dados):
-    """Salva dados no arquivo JSON"""
+def salvar_dados(dados, tabelas=('producao', 'fazendas')):
+    """Salva dados nos arquivos Parquet (só as tabelas informadas são regravadas)"""
     try:
-        with open(DADOS_FILE, 'w', encoding='utf-8') as f:
-            json.dump(dados, f, ensure_ascii=False, indent=2)
+        gravar_parquet(dados, tabelas)
+        # Limpa antes de trocar a versão: nenhuma sessão monta a versão nova com os dados antigos
+        limpar_cache()
+        contador = contador_versao()
+        with contador['trava']:
+            contador['versao'] += 1
         return True
     except:
         return False
 
+def ler_registros(caminho):
+    """Lê um arquivo Parquet como lista de registros, sem os campos opcionais vazios"""
+    registros = pd.read_parquet(caminho).to_dict('records')
+    return [{k: v for k, v in r.items() if k not in CAMPOS_OPCIONAIS or not pd.isna(v)} for r in registros]
+
+def migrar_json_legado():
+    """Converte o JSON legado direto para Parquet com o leitor JSON colunar do pyarrow"""
+    # Datas ficam como texto (o pyarrow as inferiria como timestamp); demais campos são inferidos
+    esquema = pa.schema([
+        ('fazendas', pa.list_(pa.struct([('data_cadastro', pa.string())]))),
+        ('producao', pa.list_(pa.struct([('data', pa.string())])))
+    ])
+    tabela = paj.read_json(
+        DADOS_FILE,
+        parse_options=paj.ParseOptions(newlines_in_values=True, explicit_schema=esquema)
+    )
+    # O esquema explícito põe as datas primeiro: volta à ordem dos campos nos registros legados
+    ordem_legada = {
+        'fazendas': ['id', 'nome', 'estado', 'cidade', 'hectares', 'status', 'proprietario',
+                     'telefone', 'email', 'observacoes', 'data_cadastro'],
+        'producao': ['fazenda_id', 'data', 'toneladas_projetadas', 'toneladas_entregues', 'observacoes']
+    }
+    for coluna, caminho in (('producao', PRODUCAO_FILE), ('fazendas', FAZENDAS_FILE)):
+        registros = tabela.column(coluna).combine_chunks().flatten()
+        tabela_registros = pa.Table.from_batches([pa.RecordBatch.from_struct_array(registros)])
+        nomes = tabela_registros.column_names
+        ordem = [c for c in ordem_legada[coluna] if c in nomes] + [c for c in nomes if c not in ordem_legada[coluna]]
+        pq.write_table(tabela_registros.select(ordem), caminho, compression='zstd')
+
+def gravar_parquet(dados, tabelas=('producao', 'fazendas')):
+    """Grava produção e fazendas em Parquet (fazendas por último, marcando a migração)"""
+    for tabela, caminho in (('producao', PRODUCAO_FILE), ('fazendas', FAZENDAS_FILE)):
+        # Arquivo ainda inexistente é sempre gravado, para o par ficar completo
+        if tabela in tabelas or not os.path.exists(caminho):
+            preparar_tabela(dados.get(tabela, [])).to_parquet(caminho, compression='zstd', index=False)
+
+def preparar_tabela(registros):
+    """Monta o DataFrame a gravar, convertendo para texto as colunas com tipos mistos"""
+    df = pd.DataFrame(registros)
+    # O Parquet exige um tipo por coluna (ex.: telefone ora texto, ora número no JSON)
+    for coluna in df.columns[df.dtypes == object]:
+        df[coluna] = df[coluna].where(df[coluna].isna(), df[coluna].astype(str))
+    return df
+
 def limpar_cache():
-    """Limpa o cache do Streamlit"""
+    """Limpa o cache do Streamlit (dados e figuras dos relatórios)"""
     st.cache_data.clear()
+    for figura in (figura_desempenho, figura_hectares_estado, figura_evolucao_producao):
+        figura.clear()
+
+@st.cache_resource
+def contador_versao():
+    """Contador da versão dos dados salvos (e sua trava), compartilhado entre as sessões"""
+    return {'versao': 0, 'trava': threading.Lock()}
+
+def versao_dados():
+    """Retorna a versão atual dos dados, incrementada a cada salvamento"""
+    return contador_versao()['versao']
+
+# As funções em cache recebem só a versão (chave de hash O(1)) e leem os
+# dados salvos de carregar_dados, que também fica em cache até o próximo salvamento
+
+@st.cache_data
+def construir_dataframes(versao):
+    """Monta os DataFrames de fazendas, produção e o merge entre eles"""
+    dados = carregar_dados()
+    df_fazendas = pd.DataFrame(dados.get('fazendas', []))
+    if df_fazendas.empty:
+        df_fazendas = pd.DataFrame(columns=['id', 'nome', 'estado', 'cidade', 'hectares', 'status', 'proprietario'])
+    df_fazendas['hectares'] = pd.to_numeric(df_fazendas['hectares'], errors='coerce').fillna(0).astype('float64')
+    for coluna in ('estado', 'status'):
+        df_fazendas[coluna] = df_fazendas[coluna].astype('category')
+    df_fazendas['nome_lower'] = df_fazendas['nome'].str.lower()
+    
+    df_producao = pd.DataFrame(dados.get('producao', []))
+    if df_producao.empty:
+        df_producao = pd.DataFrame(columns=['fazenda_id', 'data', 'toneladas_projetadas', 'toneladas_entregues', 'observacoes'])
+    df_producao['data'] = pd.to_datetime(df_producao['data'], format='%Y-%m-%d', cache=True, errors='coerce')
+    for coluna in ('toneladas_projetadas', 'toneladas_entregues'):
+        df_producao[coluna] = pd.to_numeric(df_producao[coluna], errors='coerce').fillna(0).astype('float64')
+    
+    df_combined = df_producao.merge(
+        df_fazendas[['id', 'nome', 'estado']],
+        left_on='fazenda_id',
+        right_on='id',
+        how='left'
+    )
+    
+    return df_fazendas, df_producao, df_combined
+
+@st.cache_data
+def indexar_fazendas(versao):
+    """Monta o índice id -> posição, o próximo ID livre e as opções "nome (estado)" -> id"""
+    df_fazendas, _, _ = construir_dataframes(versao)
+    ids = df_fazendas['id'].tolist()
+    posicoes = {fazenda_id: posicao for posicao, fazenda_id in enumerate(ids)}
+    opcoes = {
+        f"{nome} ({estado})": fazenda_id
+        for nome, estado, fazenda_id in zip(df_fazendas['nome'].tolist(), df_fazendas['estado'].tolist(), ids)
+    }
+    return posicoes, max(ids, default=0) + 1, opcoes
 
 # ===================================================================
 # FUNÇÕES AUXILIARES
 # ===================================================================
 
-def gerar_proximo_id(lista):
-    """Gera próximo ID disponível"""
-    if not lista:
-        return 1
-    return max([item.get('id', 0) for item in lista]) + 1
+def gerar_proximo_id(versao):
+    """Gera próximo ID disponível nos dados salvos da versão informada"""
+    _, proximo_id, _ = indexar_fazendas(versao)
+    return proximo_id
+
+def posicao_fazenda(dados, fazenda_id):
+    """Retorna a posição da fazenda em dados['fazendas'] (ou None), conferindo o índice em cache pelo ID"""
+    fazendas = dados['fazendas']
+    posicoes, _, _ = indexar_fazendas(versao_dados())
+    posicao = posicoes.get(fazenda_id)
+    if posicao is not None and posicao < len(fazendas) and fazendas[posicao].get('id') == fazenda_id:
+        return posicao
+    # Índice montado de outra versão dos dados (outra sessão salvou): busca pelo ID
+    return next((i for i, f in enumerate(fazendas) if f.get('id') == fazenda_id), None)
+
+def buscar_fazenda(dados, fazenda_id):
+    """Retorna a fazenda com o ID informado (ou None)"""
+    posicao = posicao_fazenda(dados, fazenda_id)
+    return dados['fazendas'][posicao] if posicao is not None else None
+
+def remover_fazenda(dados, fazenda_id):
+    """Remove a fazenda com o ID informado"""
+    posicao = posicao_fazenda(dados, fazenda_id)
+    if posicao is not None:
+        dados['fazendas'].pop(posicao)
+
+def rotulos_fazendas(versao):
+    """Retorna o mapa (em cache) de rótulos "nome (estado)" para ID das fazendas salvas"""
+    _, _, opcoes = indexar_fazendas(versao)
+    return opcoes
 
 def formatar_numero(numero):
     """Formata número com separadores de milhares"""
     return f"{numero:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
 
-def calcular_estatisticas(dados):
-    """Calcula estatísticas gerais"""
-    fazendas = dados.get('fazendas', [])
-    producao = dados.get('producao', [])
-    
-    total_fazendas = len(fazendas)
-    fazendas_ativas = len([f for f in fazendas if f.get('status') == 'ativa'])
-    total_hectares = sum([f.get('hectares', 0) for f in fazendas])
+def formatar_serie(serie):
+    """Formata uma coluna numérica inteira como formatar_numero, sem apply por linha"""
+    valores = pd.to_numeric(serie).astype('float64').fillna(0)
+    texto = pd.Series(np.char.mod('%.2f', valores.abs().to_numpy()), index=valores.index, dtype=object)
+    inteiros = texto.str[:-3].str.replace(r'\B(?=(\d{3})+(?!\d))', '.', regex=True)
+    sinais = (valores < 0).map({True: '-', False: ''})
+    return sinais + inteiros + ',' + texto.str[-2:]
+
+@st.cache_data(show_spinner=False)
+def calcular_estatisticas(versao):
+    """Calcula as estatísticas gerais dos dados salvos a partir dos DataFrames em cache"""
+    df_fazendas, _, _ = construir_dataframes(versao)
     
-    total_projetado = sum([p.get('toneladas_projetadas', 0) for p in producao])
-    total_entregue = sum([p.get('toneladas_entregues', 0) for p in producao])
+    total_fazendas = len(df_fazendas)
+    fazendas_ativas = int((df_fazendas['status'] == 'ativa').sum())
+    total_hectares = float(df_fazendas['hectares'].sum())
     
-    percentual_conclusao = (total_entregue / total_projetado * 100) if total_projetado > 0 else 0
+    total_projetado, total_entregue, percentual_conclusao, _ = totais_producao(versao)
     
     return {
         'total_fazendas': total_fazendas,
@@ -164,6 +322,179 @@ def calcular_estatisticas(dados):
         'percentual_conclusao': percentual_conclusao
     }
 
+@st.cache_data(show_spinner=False)
+def tamanho_dados(versao):
+    """Calcula o tamanho em bytes dos dados serializados em JSON (orjson, sem indentação)"""
+    dados = carregar_dados()
+    return len(orjson.dumps(
+        {'fazendas': dados.get('fazendas', []), 'producao': dados.get('producao', [])},
+        option=orjson.OPT_SERIALIZE_NUMPY
+    ))
+
+@st.cache_data
+def totais_producao(versao):
+    """Retorna (projetado, entregue, % concluído, restante) da produção"""
+    _, df_producao, _ = construir_dataframes(versao)
+    
+    projetado = float(df_producao['toneladas_projetadas'].sum())
+    entregue = float(df_producao['toneladas_entregues'].sum())
+    percentual = (entregue / projetado * 100) if projetado > 0 else 0
+    
+    return projetado, entregue, percentual, projetado - entregue
+
+@st.cache_data
+def agregar_dashboard(versao):
+    """Agrega fazendas por estado (uma única passada) e por status para o dashboard"""
+    df_fazendas, _, _ = construir_dataframes(versao)
+    
+    resumo_estado = df_fazendas.groupby('estado', observed=True).agg(
+        **{'Fazendas': ('nome', 'count'), 'Total Hectares': ('hectares', 'sum')}
+    )
+    status_valores, status_contagens = np.unique(df_fazendas['status'].dropna().to_numpy(), return_counts=True)
+    
+    return resumo_estado, status_valores, status_contagens
+
+@st.cache_data
+def agregar_producao(versao):
+    """Calcula a produção por fazenda e a evolução das entregas"""
+    _, _, df_combined = construir_dataframes(versao)
+    
+    producao_fazenda = df_combined.groupby('nome').agg({
+        'toneladas_projetadas': 'sum',
+        'toneladas_entregues': 'sum'
+    }).reset_index()
+    
+    evolucao = df_combined.groupby('data').agg({
+        'toneladas_entregues': 'sum'
+    }).reset_index()
+    
+    return producao_fazenda, evolucao
+
+@st.cache_data(show_spinner=False)
+def agregar_relatorio_fazendas(versao):
+    """Agrega quantidade de fazendas e hectares por estado para o relatório"""
+    df_fazendas, _, _ = construir_dataframes(versao)
+    
+    return df_fazendas.groupby('estado', observed=True).agg({
+        'nome': 'count',
+        'hectares': 'sum'
+    }).rename(columns={'nome': 'Quantidade', 'hectares': 'Total Hectares'})
+
+@st.cache_data(show_spinner=False)
+def agregar_relatorio_producao(versao):
+    """Agrega a produção por fazenda (com % de conclusão) e por data para o relatório"""
+    # Produção já combinada com o nome da fazenda e com as datas convertidas
+    _, _, df_combined = construir_dataframes(versao)
+    
+    # Uma única passada de groupby (fazenda x data), reagregada para cada visão
+    agregado = df_combined.groupby(['nome', 'data'], sort=False, dropna=False)[
+        ['toneladas_projetadas', 'toneladas_entregues']
+    ].sum()
+    
+    resumo_fazenda = agregado.groupby(level='nome', sort=False).sum().reset_index()
+    # Fazendas sem projeção ficam com 0% em vez de inf/NaN
+    projetado = resumo_fazenda['toneladas_projetadas'].to_numpy()
+    entregue = resumo_fazenda['toneladas_entregues'].to_numpy()
+    percentual = np.divide(entregue, projetado, out=np.zeros_like(projetado), where=projetado > 0) * 100
+    resumo_fazenda['percentual'] = np.round(percentual, 1)
+    
+    evolucao = agregado.groupby(level='data').sum().reset_index()
+    
+    return resumo_fazenda, evolucao
+
+# Figuras em cache_resource: o mesmo objeto é reaproveitado (sem cópia) até os dados mudarem;
+# limpar_cache também as descarta e max_entries limita as versões guardadas entre limpezas
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def figura_desempenho(percentual):
+    """Monta o gráfico de indicador da performance geral"""
+    import plotly.graph_objects as go
+    
+    return go.Figure(go.Indicator(
+        mode = "gauge+number+delta",
+        value = percentual,
+        domain = {'x': [0, 1], 'y': [0, 1]},
+        title = {'text': "Performance Geral (%)"},
+        delta = {'reference': 100},
+        gauge = {
+            'axis': {'range': [None, 100]},
+            'bar': {'color': "darkblue"},
+            'steps': [
+                {'range': [0, 50], 'color': "lightgray"},
+                {'range': [50, 80], 'color': "yellow"},
+                {'range': [80, 100], 'color': "green"}
+            ],
+            'threshold': {
+                'line': {'color': "red", 'width': 4},
+                'thickness': 0.75,
+                'value': 90
+            }
+        }
+    ))
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def figura_hectares_estado(versao):
+    """Monta o gráfico de hectares por estado"""
+    import plotly.express as px
+    
+    hectares_estado = agregar_relatorio_fazendas(versao)['Total Hectares']
+    return px.bar(
+        x=hectares_estado.index,
+        y=hectares_estado.to_numpy(),
+        title="🌾 Hectares por Estado",
+        labels={'x': 'Estado', 'y': 'Hectares'}
+    )
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def figura_evolucao_producao(versao):
+    """Monta o gráfico de evolução temporal da produção"""
+    import plotly.express as px
+    
+    _, evolucao = agregar_relatorio_producao(versao)
+    return px.line(
+        evolucao,
+        x='data',
+        y=['toneladas_projetadas', 'toneladas_entregues'],
+        title="📊 Evolução da Produção",
+        markers=True
+    )
+
+@st.cache_data(show_spinner=False)
+def gerar_backup_json(versao):
+    """Gera o backup completo em JSON indentado"""
+    dados = carregar_dados()
+    return orjson.dumps(
+        {'fazendas': dados.get('fazendas', []), 'producao': dados.get('producao', [])},
+        option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+    )
+
+@st.cache_data(show_spinner=False)
+def ler_planilha(nome_arquivo, conteudo):
+    """Lê um arquivo Excel/CSV enviado, reaproveitando a leitura enquanto o arquivo não muda"""
+    def usar_coluna(coluna):
+        return str(coluna).lower() in COLUNAS_IMPORTACAO
+    
+    if nome_arquivo.endswith('.csv'):
+        # O engine pyarrow (multithread) não aceita usecols como função: filtra após a leitura
+        df = pd.read_csv(BytesIO(conteudo), engine='pyarrow')
+        return df.loc[:, [usar_coluna(coluna) for coluna in df.columns]]
+    return pd.read_excel(BytesIO(conteudo), usecols=usar_coluna)
+
+@st.cache_data(show_spinner=False)
+def gerar_excel(versao, tabela):
+    """Gera o conteúdo de um arquivo Excel com os registros de uma tabela"""
+    buffer = BytesIO()
+    # xlsxwriter grava mais rápido que o openpyxl; constant_memory não é usado porque
+    # o pandas não escreve as células linha a linha e o modo descartaria valores
+    with pd.ExcelWriter(buffer, engine='xlsxwriter') as writer:
+        pd.DataFrame(carregar_dados().get(tabela, [])).to_excel(writer, index=False)
+    return buffer.getvalue()
+
+@st.cache_data(show_spinner=False)
+def gerar_csv(versao, tabela):
+    """Gera o conteúdo de um arquivo CSV com os registros de uma tabela"""
+    return pd.DataFrame(carregar_dados().get(tabela, [])).to_csv(index=False)
+
 # ===================================================================
 # INTERFACE PRINCIPAL
 # ===================================================================
@@ -209,10 +540,12 @@ def main():
 # ===================================================================
 
 def mostrar_dashboard(dados):
+    import plotly.graph_objects as go
+    
     st.header("📊 Dashboard Geral")
     
     # Calcular estatísticas
-    stats = calcular_estatisticas(dados)
+    stats = calcular_estatisticas(versao_dados())
     
     # Métricas principais
     col1, col2, col3, col4 = st.columns(4)
@@ -248,41 +581,38 @@ def mostrar_dashboard(dados):
     st.markdown("---")
     
     # Gráficos
+    resumo_estado, status_valores, status_contagens = agregar_dashboard(versao_dados())
+    
     col1, col2 = st.columns(2)
     
     with col1:
         # Gráfico de fazendas por estado
-        fazendas_df = pd.DataFrame(dados['fazendas'])
-        if not fazendas_df.empty:
-            fig_estados = px.pie(
-                fazendas_df.groupby('estado').size().reset_index(name='count'),
-                values='count',
-                names='estado',
-                title="📍 Distribuição por Estado"
-            )
+        if not resumo_estado.empty:
+            fig_estados = go.Figure(go.Pie(
+                labels=resumo_estado.index.to_numpy(),
+                values=resumo_estado['Fazendas'].to_numpy()
+            ))
+            fig_estados.update_layout(title="📍 Distribuição por Estado")
             st.plotly_chart(fig_estados, use_container_width=True)
     
     with col2:
         # Gráfico de status das fazendas
-        if not fazendas_df.empty:
-            status_counts = fazendas_df['status'].value_counts()
-            fig_status = px.bar(
-                x=status_counts.index,
-                y=status_counts.values,
+        if len(status_valores):
+            fig_status = go.Figure(go.Bar(
+                x=status_valores,
+                y=status_contagens
+            ))
+            fig_status.update_layout(
                 title="📊 Status das Fazendas",
-                labels={'x': 'Status', 'y': 'Quantidade'}
+                xaxis_title="Status",
+                yaxis_title="Quantidade"
             )
             st.plotly_chart(fig_status, use_container_width=True)
     
     # Tabela resumo por estado
     st.subheader("📋 Resumo por Estado")
-    if not fazendas_df.empty:
-        resumo_estado = fazendas_df.groupby('estado').agg({
-            'nome': 'count',
-            'hectares': 'sum'
-        }).rename(columns={'nome': 'Fazendas', 'hectares': 'Total Hectares'})
-        
-        resumo_estado['Total Hectares'] = resumo_estado['Total Hectares'].apply(formatar_numero)
+    if not resumo_estado.empty:
+        resumo_estado['Total Hectares'] = formatar_serie(resumo_estado['Total Hectares'])
         st.dataframe(resumo_estado, use_container_width=True)
 
 # ===================================================================
@@ -316,8 +646,10 @@ def mostrar_lista_fazendas(dados):
     # Filtros
     col1, col2, col3 = st.columns(3)
     
+    df_fazendas, _, _ = construir_dataframes(versao_dados())
+    
     with col1:
-        estados = list(set([f['estado'] for f in fazendas]))
+        estados = df_fazendas['estado'].unique().tolist()
         estado_filtro = st.selectbox("Filtrar por Estado:", ["Todos"] + estados)
     
     with col2:
@@ -326,29 +658,29 @@ def mostrar_lista_fazendas(dados):
     with col3:
         busca = st.text_input("Buscar por nome:")
     
-    # Aplicar filtros
-    fazendas_filtradas = fazendas.copy()
+    # Aplicar filtros (máscara booleana única, sem cópias intermediárias)
+    mascara = pd.Series(True, index=df_fazendas.index)
     
     if estado_filtro != "Todos":
-        fazendas_filtradas = [f for f in fazendas_filtradas if f['estado'] == estado_filtro]
+        mascara &= df_fazendas['estado'] == estado_filtro
     
     if status_filtro != "Todos":
-        fazendas_filtradas = [f for f in fazendas_filtradas if f['status'] == status_filtro]
+        mascara &= df_fazendas['status'] == status_filtro
     
     if busca:
-        fazendas_filtradas = [f for f in fazendas_filtradas if busca.lower() in f['nome'].lower()]
+        mascara &= df_fazendas['nome_lower'].str.contains(busca.lower(), regex=False, na=False)
     
     # Mostrar fazendas
-    if fazendas_filtradas:
-        df = pd.DataFrame(fazendas_filtradas)
-        df['hectares'] = df['hectares'].apply(formatar_numero)
+    total_filtradas = int(mascara.sum())
+    if total_filtradas:
+        df = df_fazendas.loc[mascara, ['nome', 'estado', 'cidade', 'hectares', 'status', 'proprietario']]
         
         st.dataframe(
-            df[['nome', 'estado', 'cidade', 'hectares', 'status', 'proprietario']],
+            df.assign(hectares=formatar_serie(df['hectares'])),
             use_container_width=True
         )
         
-        st.info(f"Mostrando {len(fazendas_filtradas)} de {len(fazendas)} fazendas")
+        st.info(f"Mostrando {total_filtradas} de {len(fazendas)} fazendas")
     else:
         st.warning("Nenhuma fazenda encontrada com os filtros aplicados.")
 
@@ -382,7 +714,7 @@ def cadastrar_nova_fazenda(dados):
                 st.error("Por favor, preencha todos os campos obrigatórios (*)")
             else:
                 nova_fazenda = {
-                    "id": gerar_proximo_id(dados['fazendas']),
+                    "id": gerar_proximo_id(versao_dados()),
                     "nome": nome,
                     "estado": estado,
                     "cidade": cidade,
@@ -397,9 +729,8 @@ def cadastrar_nova_fazenda(dados):
                 
                 dados['fazendas'].append(nova_fazenda)
                 
-                if salvar_dados(dados):
+                if salvar_dados(dados, tabelas=('fazendas',)):
                     st.success(f"✅ Fazenda '{nome}' cadastrada com sucesso!")
-                    limpar_cache()
                     st.rerun()
                 else:
                     st.error("❌ Erro ao salvar dados. Tente novamente.")
@@ -414,12 +745,12 @@ def editar_fazenda(dados):
         return
     
     # Seleção da fazenda
-    opcoes_fazendas = {f"{f['nome']} ({f['estado']})": f['id'] for f in fazendas}
+    opcoes_fazendas = rotulos_fazendas(versao_dados())
     fazenda_selecionada = st.selectbox("Selecione a fazenda para editar:", list(opcoes_fazendas.keys()))
     
     if fazenda_selecionada:
         fazenda_id = opcoes_fazendas[fazenda_selecionada]
-        fazenda = next((f for f in fazendas if f['id'] == fazenda_id), None)
+        fazenda = buscar_fazenda(dados, fazenda_id)
         
         if fazenda:
             with st.form("editar_fazenda"):
@@ -468,9 +799,8 @@ def editar_fazenda(dados):
                             "observacoes": observacoes
                         })
                         
-                        if salvar_dados(dados):
+                        if salvar_dados(dados, tabelas=('fazendas',)):
                             st.success(f"✅ Fazenda '{nome}' atualizada com sucesso!")
-                            limpar_cache()
                             st.rerun()
                         else:
                             st.error("❌ Erro ao salvar dados. Tente novamente.")
@@ -481,12 +811,11 @@ def editar_fazenda(dados):
                         st.warning("⚠️ Clique novamente para confirmar a exclusão!")
                     else:
                         # Remover fazenda
-                        dados['fazendas'] = [f for f in dados['fazendas'] if f['id'] != fazenda_id]
+                        remover_fazenda(dados, fazenda_id)
                         
-                        if salvar_dados(dados):
+                        if salvar_dados(dados, tabelas=('fazendas',)):
                             st.success(f"✅ Fazenda '{fazenda['nome']}' excluída com sucesso!")
                             del st.session_state.confirmar_exclusao
-                            limpar_cache()
                             st.rerun()
                         else:
                             st.error("❌ Erro ao salvar dados. Tente novamente.")
@@ -510,35 +839,24 @@ def controle_producao(dados):
         historico_producao(dados)
 
 def visao_geral_producao(dados):
+    import plotly.graph_objects as go
+    
     st.subheader("📊 Visão Geral da Produção")
     
     producao = dados.get('producao', [])
-    fazendas = dados.get('fazendas', [])
     
     if not producao:
         st.warning("Nenhum registro de produção encontrado.")
         return
     
-    # Criar DataFrame com dados combinados
-    df_producao = pd.DataFrame(producao)
-    df_fazendas = pd.DataFrame(fazendas)
-    
-    # Merge dos dados
-    df_combined = df_producao.merge(
-        df_fazendas[['id', 'nome', 'estado']], 
-        left_on='fazenda_id', 
-        right_on='id', 
-        how='left'
-    )
+    # Agregações (em cache)
+    versao = versao_dados()
+    total_projetado, total_entregue, percentual, restante = totais_producao(versao)
+    producao_fazenda, evolucao = agregar_producao(versao)
     
     # Métricas
     col1, col2, col3, col4 = st.columns(4)
     
-    total_projetado = df_producao['toneladas_projetadas'].sum()
-    total_entregue = df_producao['toneladas_entregues'].sum()
-    percentual = (total_entregue / total_projetado * 100) if total_projetado > 0 else 0
-    restante = total_projetado - total_entregue
-    
     with col1:
         st.metric("📦 Projetado", formatar_numero(total_projetado))
     
@@ -556,33 +874,27 @@ def visao_geral_producao(dados):
     
     with col1:
         # Produção por fazenda
-        producao_fazenda = df_combined.groupby('nome').agg({
-            'toneladas_projetadas': 'sum',
-            'toneladas_entregues': 'sum'
-        }).reset_index()
-        
-        fig_fazenda = px.bar(
-            producao_fazenda,
-            x='nome',
-            y=['toneladas_projetadas', 'toneladas_entregues'],
-            title="📊 Produção por Fazenda",
-            barmode='group'
+        nomes = producao_fazenda['nome'].to_numpy()
+        fig_fazenda = go.Figure(
+            [
+                go.Bar(x=nomes, y=producao_fazenda[coluna].to_numpy(), name=coluna)
+                for coluna in ('toneladas_projetadas', 'toneladas_entregues')
+            ],
+            layout=dict(title="📊 Produção por Fazenda", barmode='group', xaxis_title="nome")
         )
         st.plotly_chart(fig_fazenda, use_container_width=True)
     
     with col2:
         # Evolução temporal
-        df_combined['data'] = pd.to_datetime(df_combined['data'])
-        evolucao = df_combined.groupby('data').agg({
-            'toneladas_entregues': 'sum'
-        }).reset_index()
-        
-        fig_evolucao = px.line(
-            evolucao,
-            x='data',
-            y='toneladas_entregues',
+        fig_evolucao = go.Figure(go.Scattergl(
+            x=evolucao['data'].to_numpy(),
+            y=evolucao['toneladas_entregues'].to_numpy(),
+            mode='lines+markers'
+        ))
+        fig_evolucao.update_layout(
             title="📈 Evolução das Entregas",
-            markers=True
+            xaxis_title="data",
+            yaxis_title="toneladas_entregues"
         )
         st.plotly_chart(fig_evolucao, use_container_width=True)
 
@@ -599,7 +911,7 @@ def novo_registro_producao(dados):
         col1, col2 = st.columns(2)
         
         with col1:
-            opcoes_fazendas = {f"{f['nome']} ({f['estado']})": f['id'] for f in fazendas}
+            opcoes_fazendas = rotulos_fazendas(versao_dados())
             fazenda_selecionada = st.selectbox("Fazenda*", list(opcoes_fazendas.keys()))
             data_registro = st.date_input("Data*", value=date.today())
         
@@ -630,9 +942,8 @@ def novo_registro_producao(dados):
                 
                 dados['producao'].append(novo_registro)
                 
-                if salvar_dados(dados):
+                if salvar_dados(dados, tabelas=('producao',)):
                     st.success("✅ Registro de produção salvo com sucesso!")
-                    limpar_cache()
                     st.rerun()
                 else:
                     st.error("❌ Erro ao salvar dados. Tente novamente.")
@@ -641,22 +952,13 @@ def historico_producao(dados):
     st.subheader("📋 Histórico de Produção")
     
     producao = dados.get('producao', [])
-    fazendas = dados.get('fazendas', [])
     
     if not producao:
         st.warning("Nenhum registro de produção encontrado.")
         return
     
-    # Criar DataFrame com dados combinados
-    df_producao = pd.DataFrame(producao)
-    df_fazendas = pd.DataFrame(fazendas)
-    
-    df_combined = df_producao.merge(
-        df_fazendas[['id', 'nome', 'estado']], 
-        left_on='fazenda_id', 
-        right_on='id', 
-        how='left'
-    )
+    # DataFrames com dados combinados (em cache)
+    _, _, df_combined = construir_dataframes(versao_dados())
     
     # Filtros
     col1, col2, col3 = st.columns(3)
@@ -666,29 +968,28 @@ def historico_producao(dados):
         fazenda_filtro = st.selectbox("Filtrar por Fazenda:", ["Todas"] + list(fazendas_unicas))
     
     with col2:
-        data_inicio = st.date_input("Data Início:", value=pd.to_datetime(df_combined['data']).min())
+        data_inicio = st.date_input("Data Início:", value=df_combined['data'].min())
     
     with col3:
-        data_fim = st.date_input("Data Fim:", value=pd.to_datetime(df_combined['data']).max())
+        data_fim = st.date_input("Data Fim:", value=df_combined['data'].max())
     
-    # Aplicar filtros
-    df_filtrado = df_combined.copy()
+    # Aplicar filtros (máscara booleana única, sem cópias intermediárias)
+    mascara = (
+        (df_combined['data'] >= pd.Timestamp(data_inicio)) &
+        (df_combined['data'] <= pd.Timestamp(data_fim))
+    )
     
     if fazenda_filtro != "Todas":
-        df_filtrado = df_filtrado[df_filtrado['nome'] == fazenda_filtro]
+        mascara &= df_combined['nome'] == fazenda_filtro
     
-    df_filtrado['data'] = pd.to_datetime(df_filtrado['data'])
-    df_filtrado = df_filtrado[
-        (df_filtrado['data'] >= pd.to_datetime(data_inicio)) &
-        (df_filtrado['data'] <= pd.to_datetime(data_fim))
-    ]
+    df_filtrado = df_combined.loc[mascara]
     
     # Mostrar dados
     if not df_filtrado.empty:
         df_display = df_filtrado[['nome', 'data', 'toneladas_projetadas', 'toneladas_entregues', 'observacoes']].copy()
         df_display['data'] = df_display['data'].dt.strftime('%d/%m/%Y')
-        df_display['toneladas_projetadas'] = df_display['toneladas_projetadas'].apply(formatar_numero)
-        df_display['toneladas_entregues'] = df_display['toneladas_entregues'].apply(formatar_numero)
+        df_display['toneladas_projetadas'] = formatar_serie(df_display['toneladas_projetadas'])
+        df_display['toneladas_entregues'] = formatar_serie(df_display['toneladas_entregues'])
         
         df_display.columns = ['Fazenda', 'Data', 'Projetado', 'Entregue', 'Observações']
         
@@ -705,21 +1006,29 @@ def historico_producao(dados):
 def mostrar_relatorios(dados):
     st.header("📋 Relatórios")
     
-    tab1, tab2, tab3 = st.tabs(["📊 Relatório Geral", "🏡 Relatório de Fazendas", "📈 Relatório de Produção"])
+    aba = st.radio(
+        "Relatório:",
+        [
+            "📊 Relatório Geral",
+            "🏡 Relatório de Fazendas",
+            "📈 Relatório de Produção"
+        ],
+        horizontal=True,
+        label_visibility="collapsed"
+    )
     
-    with tab1:
+    # Só a aba selecionada é executada (st.tabs executaria todas a cada rerun)
+    if aba == "📊 Relatório Geral":
         relatorio_geral(dados)
-    
-    with tab2:
+    elif aba == "🏡 Relatório de Fazendas":
         relatorio_fazendas(dados)
-    
-    with tab3:
+    else:
         relatorio_producao(dados)
 
 def relatorio_geral(dados):
     st.subheader("📊 Relatório Geral")
     
-    stats = calcular_estatisticas(dados)
+    stats = calcular_estatisticas(versao_dados())
     
     # Resumo executivo
     st.markdown("### 📋 Resumo Executivo")
@@ -747,28 +1056,7 @@ def relatorio_geral(dados):
     
     # Gráfico de performance
     if stats['total_projetado'] > 0:
-        fig = go.Figure(go.Indicator(
-            mode = "gauge+number+delta",
-            value = stats['percentual_conclusao'],
-            domain = {'x': [0, 1], 'y': [0, 1]},
-            title = {'text': "Performance Geral (%)"},
-            delta = {'reference': 100},
-            gauge = {
-                'axis': {'range': [None, 100]},
-                'bar': {'color': "darkblue"},
-                'steps': [
-                    {'range': [0, 50], 'color': "lightgray"},
-                    {'range': [50, 80], 'color': "yellow"},
-                    {'range': [80, 100], 'color': "green"}
-                ],
-                'threshold': {
-                    'line': {'color': "red", 'width': 4},
-                    'thickness': 0.75,
-                    'value': 90
-                }
-            }
-        ))
-        
+        fig = figura_desempenho(stats['percentual_conclusao'])
         st.plotly_chart(fig, use_container_width=True)
 
 def relatorio_fazendas(dados):
@@ -780,69 +1068,49 @@ def relatorio_fazendas(dados):
         st.warning("Nenhuma fazenda cadastrada.")
         return
     
-    df = pd.DataFrame(fazendas)
+    # DataFrames e agregações em cache, compartilhando a mesma versão
+    versao = versao_dados()
+    df, _, _ = construir_dataframes(versao)
     
     # Estatísticas por estado
     st.markdown("### 📍 Distribuição por Estado")
     
-    estado_stats = df.groupby('estado').agg({
-        'nome': 'count',
-        'hectares': 'sum'
-    }).rename(columns={'nome': 'Quantidade', 'hectares': 'Total Hectares'})
+    estado_stats = agregar_relatorio_fazendas(versao)
     
-    estado_stats['Total Hectares'] = estado_stats['Total Hectares'].apply(formatar_numero)
-    st.dataframe(estado_stats, use_container_width=True)
+    # Hectares numéricos para o gráfico; cópia formatada apenas para exibição
+    hectares_estado = estado_stats['Total Hectares']
+    st.dataframe(
+        estado_stats.assign(**{'Total Hectares': formatar_serie(hectares_estado)}),
+        use_container_width=True
+    )
     
     # Gráfico de hectares por estado
-    fig = px.bar(
-        x=estado_stats.index,
-        y=[float(x.replace('.', '').replace(',', '.')) for x in estado_stats['Total Hectares']],
-        title="🌾 Hectares por Estado",
-        labels={'x': 'Estado', 'y': 'Hectares'}
-    )
+    fig = figura_hectares_estado(versao)
     st.plotly_chart(fig, use_container_width=True)
     
     # Lista detalhada
     st.markdown("### 📋 Lista Detalhada")
-    df_display = df[['nome', 'estado', 'cidade', 'hectares', 'status', 'proprietario']].copy()
-    df_display['hectares'] = df_display['hectares'].apply(formatar_numero)
-    st.dataframe(df_display, use_container_width=True)
+    df_display = df[['nome', 'estado', 'cidade', 'hectares', 'status', 'proprietario']]
+    st.dataframe(df_display.assign(hectares=formatar_serie(df_display['hectares'])), use_container_width=True)
 
 def relatorio_producao(dados):
     st.subheader("📈 Relatório de Produção")
     
     producao = dados.get('producao', [])
-    fazendas = dados.get('fazendas', [])
     
     if not producao:
         st.warning("Nenhum registro de produção encontrado.")
         return
     
-    # Criar DataFrame combinado
-    df_producao = pd.DataFrame(producao)
-    df_fazendas = pd.DataFrame(fazendas)
-    
-    df_combined = df_producao.merge(
-        df_fazendas[['id', 'nome', 'estado']], 
-        left_on='fazenda_id', 
-        right_on='id', 
-        how='left'
-    )
+    # Agregações (em cache)
+    versao = versao_dados()
+    resumo_fazenda, _ = agregar_relatorio_producao(versao)
     
     # Resumo por fazenda
     st.markdown("### 🏡 Produção por Fazenda")
     
-    resumo_fazenda = df_combined.groupby('nome').agg({
-        'toneladas_projetadas': 'sum',
-        'toneladas_entregues': 'sum'
-    }).reset_index()
-    
-    resumo_fazenda['percentual'] = (
-        resumo_fazenda['toneladas_entregues'] / resumo_fazenda['toneladas_projetadas'] * 100
-    ).round(1)
-    
-    resumo_fazenda['toneladas_projetadas'] = resumo_fazenda['toneladas_projetadas'].apply(formatar_numero)
-    resumo_fazenda['toneladas_entregues'] = resumo_fazenda['toneladas_entregues'].apply(formatar_numero)
+    resumo_fazenda['toneladas_projetadas'] = formatar_serie(resumo_fazenda['toneladas_projetadas'])
+    resumo_fazenda['toneladas_entregues'] = formatar_serie(resumo_fazenda['toneladas_entregues'])
     
     resumo_fazenda.columns = ['Fazenda', 'Projetado', 'Entregue', '% Conclusão']
     
@@ -851,19 +1119,7 @@ def relatorio_producao(dados):
     # Gráfico de evolução
     st.markdown("### 📈 Evolução Temporal")
     
-    df_combined['data'] = pd.to_datetime(df_combined['data'])
-    evolucao = df_combined.groupby('data').agg({
-        'toneladas_projetadas': 'sum',
-        'toneladas_entregues': 'sum'
-    }).reset_index()
-    
-    fig = px.line(
-        evolucao,
-        x='data',
-        y=['toneladas_projetadas', 'toneladas_entregues'],
-        title="📊 Evolução da Produção",
-        markers=True
-    )
+    fig = figura_evolucao_producao(versao)
     st.plotly_chart(fig, use_container_width=True)
 
 # ===================================================================
@@ -873,12 +1129,19 @@ def relatorio_producao(dados):
 def importar_exportar(dados):
     st.header("📤 Importar/Exportar Dados")
     
-    tab1, tab2 = st.tabs(["📥 Importar", "📤 Exportar"])
+    aba = st.radio(
+        "Operação:",
+        [
+            "📥 Importar",
+            "📤 Exportar"
+        ],
+        horizontal=True,
+        label_visibility="collapsed"
+    )
     
-    with tab1:
+    if aba == "📥 Importar":
         importar_dados(dados)
-    
-    with tab2:
+    else:
         exportar_dados(dados)
 
 def importar_dados(dados):
@@ -905,50 +1168,53 @@ def importar_dados(dados):
     if arquivo:
         try:
             if tipo_import == "Fazendas (Excel/CSV)":
-                if arquivo.name.endswith('.csv'):
-                    df = pd.read_csv(arquivo)
-                else:
-                    df = pd.read_excel(arquivo)
+                df = ler_planilha(arquivo.name, arquivo.getvalue())
                 
                 st.markdown("### 👀 Preview dos Dados")
                 st.dataframe(df.head(), use_container_width=True)
                 
                 if st.button("✅ Importar Fazendas"):
-                    # Processar importação de fazendas
-                    importadas = 0
-                    for _, row in df.iterrows():
-                        nova_fazenda = {
-                            "id": gerar_proximo_id(dados['fazendas']),
-                            "nome": str(row.get('nome', row.get('FAZENDA', ''))),
-                            "estado": str(row.get('estado', 'Goiás')),
-                            "cidade": str(row.get('cidade', row.get('CIDADE', ''))),
-                            "hectares": float(row.get('hectares', row.get('HA', 0))),
-                            "status": "ativa",
-                            "proprietario": str(row.get('proprietario', 'Não informado')),
-                            "telefone": str(row.get('telefone', '')),
-                            "email": str(row.get('email', '')),
-                            "data_cadastro": datetime.now().strftime("%Y-%m-%d")
-                        }
-                        dados['fazendas'].append(nova_fazenda)
-                        importadas += 1
+                    # Processar importação de fazendas (colunas inteiras de uma vez)
+                    proximo_id = gerar_proximo_id(versao_dados())
+                    novas_fazendas = pd.DataFrame({
+                        "id": np.arange(proximo_id, proximo_id + len(df)),
+                        "nome": df.get('nome', df.get('FAZENDA', '')),
+                        "estado": df.get('estado', 'Goiás'),
+                        "cidade": df.get('cidade', df.get('CIDADE', '')),
+                        "hectares": df.get('hectares', df.get('HA', 0)),
+                        "status": "ativa",
+                        "proprietario": df.get('proprietario', 'Não informado'),
+                        "telefone": df.get('telefone', ''),
+                        "email": df.get('email', ''),
+                        "data_cadastro": datetime.now().strftime("%Y-%m-%d")
+                    }).astype({
+                        "nome": str, "estado": str, "cidade": str, "hectares": float,
+                        "proprietario": str, "telefone": str, "email": str
+                    })
                     
-                    if salvar_dados(dados):
+                    dados['fazendas'].extend(novas_fazendas.to_dict('records'))
+                    importadas = len(novas_fazendas)
+                    
+                    if salvar_dados(dados, tabelas=('fazendas',)):
                         st.success(f"✅ {importadas} fazendas importadas com sucesso!")
-                        limpar_cache()
                         st.rerun()
                     else:
                         st.error("❌ Erro ao salvar dados.")
             
             elif tipo_import == "Backup Completo (JSON)":
-                dados_json = json.load(arquivo)
+                # json da biblioteca padrão: aceita o literal NaN dos backups antigos (o orjson não)
+                dados_json = json.loads(arquivo.getvalue())
                 
+                # Preview só com os primeiros registros de cada lista, não o backup inteiro
                 st.markdown("### 👀 Preview do Backup")
-                st.json(dados_json)
+                fazendas_backup = dados_json.get('fazendas', [])
+                producao_backup = dados_json.get('producao', [])
+                st.info(f"Backup com {len(fazendas_backup)} fazendas e {len(producao_backup)} registros de produção")
+                st.json({'fazendas': fazendas_backup[:5], 'producao': producao_backup[:5]})
                 
                 if st.button("✅ Restaurar Backup"):
                     if salvar_dados(dados_json):
                         st.success("✅ Backup restaurado com sucesso!")
-                        limpar_cache()
                         st.rerun()
                     else:
                         st.error("❌ Erro ao restaurar backup.")
@@ -959,6 +1225,9 @@ def importar_dados(dados):
 def exportar_dados(dados):
     st.subheader("📤 Exportar Dados")
     
+    # Arquivos gerados em cache, só refeitos quando os dados mudam
+    versao = versao_dados()
+    
     col1, col2 = st.columns(2)
     
     with col1:
@@ -966,21 +1235,16 @@ def exportar_dados(dados):
         
         fazendas = dados.get('fazendas', [])
         if fazendas:
-            df_fazendas = pd.DataFrame(fazendas)
-            
             # Excel
-            buffer = BytesIO()
-            df_fazendas.to_excel(buffer, index=False)
-            
             st.download_button(
                 label="📊 Download Excel",
-                data=buffer.getvalue(),
+                data=gerar_excel(versao, 'fazendas'),
                 file_name=f"fazendas_{datetime.now().strftime('%Y%m%d')}.xlsx",
                 mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
             )
             
             # CSV
-            csv = df_fazendas.to_csv(index=False)
+            csv = gerar_csv(versao, 'fazendas')
             st.download_button(
                 label="📄 Download CSV",
                 data=csv,
@@ -995,21 +1259,16 @@ def exportar_dados(dados):
         
         producao = dados.get('producao', [])
         if producao:
-            df_producao = pd.DataFrame(producao)
-            
             # Excel
-            buffer = BytesIO()
-            df_producao.to_excel(buffer, index=False)
-            
             st.download_button(
                 label="📊 Download Excel",
-                data=buffer.getvalue(),
+                data=gerar_excel(versao, 'producao'),
                 file_name=f"producao_{datetime.now().strftime('%Y%m%d')}.xlsx",
                 mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
             )
             
             # CSV
-            csv = df_producao.to_csv(index=False)
+            csv = gerar_csv(versao, 'producao')
             st.download_button(
                 label="📄 Download CSV",
                 data=csv,
@@ -1023,7 +1282,7 @@ def exportar_dados(dados):
     st.markdown("### 💾 Backup Completo")
     
     # JSON completo
-    json_data = json.dumps(dados, ensure_ascii=False, indent=2)
+    json_data = gerar_backup_json(versao)
     st.download_button(
         label="💾 Download Backup JSON",
         data=json_data,
@@ -1038,15 +1297,22 @@ def exportar_dados(dados):
 def configuracoes(dados):
     st.header("⚙️ Configurações")
     
-    tab1, tab2, tab3 = st.tabs(["🔧 Sistema", "📊 Dados", "ℹ️ Sobre"])
+    aba = st.radio(
+        "Seção:",
+        [
+            "🔧 Sistema",
+            "📊 Dados",
+            "ℹ️ Sobre"
+        ],
+        horizontal=True,
+        label_visibility="collapsed"
+    )
     
-    with tab1:
+    if aba == "🔧 Sistema":
         configuracoes_sistema(dados)
-    
-    with tab2:
+    elif aba == "📊 Dados":
         gerenciar_dados(dados)
-    
-    with tab3:
+    else:
         sobre_sistema()
 
 def configuracoes_sistema(dados):
@@ -1076,7 +1342,7 @@ def gerenciar_dados(dados):
     st.subheader("📊 Gerenciar Dados")
     
     # Estatísticas
-    stats = calcular_estatisticas(dados)
+    stats = calcular_estatisticas(versao_dados())
     
     st.markdown("### 📈 Estatísticas do Sistema")
     
@@ -1093,7 +1359,7 @@ def gerenciar_dados(dados):
     
     with col3:
         # Tamanho dos dados
-        dados_size = len(json.dumps(dados))
+        dados_size = tamanho_dados(versao_dados())
         st.metric("💾 Tamanho Dados", f"{dados_size:,} bytes")
         st.metric("✅ % Conclusão", f"{stats['percentual_conclusao']:.1f}%")
     
@@ -1113,7 +1379,6 @@ def gerenciar_dados(dados):
                 # Resetar para dados iniciais
                 if salvar_dados(DADOS_INICIAIS):
                     st.success("✅ Dados resetados!")
-                    limpar_cache()
                     st.rerun()
                 else:
                     st.error("❌ Erro ao resetar dados.")
@@ -1144,7 +1409,7 @@ def sobre_sistema():
     - **Streamlit**: Interface web interativa
     - **Pandas**: Manipulação de dados
     - **Plotly**: Gráficos interativos
-    - **JSON**: Persistência de dados
+    - **Parquet**: Persistência de dados
     
     ### 📞 Suporte
     
@@ -1158,7 +1423,7 @@ def sobre_sistema():
     # Informações técnicas
     with st.expander("🔧 Informações Técnicas"):
         st.markdown(f"""
-        - **Arquivo de dados:** `{DADOS_FILE}`
+        - **Arquivos de dados:** `{FAZENDAS_FILE}`, `{PRODUCAO_FILE}`
         - **Última atualização:** {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}
         - **Streamlit versão:** {st.__version__}
         - **Python versão:** Disponível no ambiente